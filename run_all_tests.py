@@ -0,0 +1,93 @@
+"""
+Run All Tests
+==============
+
+Discovers ``test_*.py`` files under ``src/`` and runs them all in one
+``python -m pytest`` invocation: the interpreter starts and the shared
+modules import exactly once, instead of once per file.  Per-file
+pass/fail counts for the summary table are recovered from pytest's
+JUnit XML report.
+
+Run directly:
+
+    python run_all_tests.py
+"""
+
+import subprocess
+import sys
+import tempfile
+import xml.etree.ElementTree as ET
+from collections import defaultdict
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent
+
+
+def discover_tests():
+    """Return (path, label) pairs for every test file in the tree."""
+    return [
+        (path, str(path.relative_to(REPO_ROOT)))
+        for path in sorted(REPO_ROOT.glob("src/**/test_*.py"))
+    ]
+
+
+def summarize_report(report_path):
+    """Map each test file to its (passed, failed, skipped) counts."""
+    counts = defaultdict(lambda: [0, 0, 0])
+    for testcase in ET.parse(report_path).getroot().iter("testcase"):
+        # pytest records the originating file relative to the rootdir.
+        key = testcase.get("file") or testcase.get("classname", "?")
+        if testcase.find("failure") is not None or testcase.find("error") is not None:
+            counts[key][1] += 1
+        elif testcase.find("skipped") is not None:
+            counts[key][2] += 1
+        else:
+            counts[key][0] += 1
+    return counts
+
+
+def main():
+    tests = discover_tests()
+    if not tests:
+        print("No test files found under src/")
+        return 0
+
+    with tempfile.NamedTemporaryFile(suffix=".xml") as report:
+        proc = subprocess.run(
+            [
+                sys.executable,
+                "-m",
+                "pytest",
+                "-q",
+                f"--junitxml={report.name}",
+                *(str(path) for path, _ in tests),
+            ],
+            cwd=REPO_ROOT,
+            capture_output=True,
+            text=True,
+        )
+        try:
+            counts = summarize_report(report.name)
+        except ET.ParseError:
+            # pytest died before writing a report — show its output raw.
+            print(proc.stdout, end="")
+            print(proc.stderr, end="", file=sys.stderr)
+            return proc.returncode
+
+    failures = 0
+    for key in sorted(counts):
+        passed, failed, skipped = counts[key]
+        status = "PASS" if failed == 0 else "FAIL"
+        print(f"[{status}] {key}: {passed} passed, {failed} failed, {skipped} skipped")
+        failures += failed
+    if proc.returncode != 0:
+        print(proc.stdout, end="")
+        print(proc.stderr, end="", file=sys.stderr)
+
+    total = sum(sum(c) for c in counts.values())
+    print(f"\n{total - failures}/{total} tests passed")
+    return 1 if failures or proc.returncode else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
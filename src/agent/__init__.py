@@ -0,0 +1 @@
+"""Agent-side orchestration package: task pipeline, workflow routing and examples."""
@@ -0,0 +1,643 @@
+"""
+Task Pipeline
+=============
+
+Celery-backed submission layer between the agents and the simulation
+workers.  A ``TaskPipeline`` submits single tasks, batches and parameter
+sweeps to the broker (Redis by default), and offers blocking helpers for
+waiting on and summarizing running workflows.
+
+The worker side registers the ``worker.run_simulation`` task; this
+module only needs the broker/backend URLs to talk to it.
+"""
+
+import hashlib
+import itertools
+import json
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import numpy as np
+from celery import Celery, chord, group
+from celery.exceptions import TimeoutError as CeleryTimeoutError
+from kombu.utils.uuid import uuid
+
+try:
+    from diskcache import Cache
+except ImportError:  # diskcache is optional; no cache without it
+    Cache = None
+
+BROKER_URL = os.environ.get("KEYSTONE_BROKER_URL", "redis://localhost:6379/0")
+BACKEND_URL = os.environ.get("KEYSTONE_BACKEND_URL", "redis://localhost:6379/0")
+
+SIMULATION_TASK = "worker.run_simulation"
+SIM_CACHE_DIR = os.environ.get("KEYSTONE_SIM_CACHE", "./.sim_cache")
+
+#: Celery states after which a task's result can no longer change.
+TERMINAL_STATES = frozenset({"SUCCESS", "FAILURE", "REVOKED"})
+
+app = Celery("keystone", broker=BROKER_URL, backend=BACKEND_URL)
+
+
+class TaskPipeline:
+    """Client-side handle for submitting and tracking simulation tasks."""
+
+    #: Upper bound and early-flush delay for adaptive batch sizing.
+    AUTO_MAX_BATCH = 64
+    AUTO_FLUSH_DELAY = 0.25
+
+    #: Bound on the terminal-status cache (entries, oldest evicted first).
+    TERMINAL_CACHE_MAX = 100_000
+
+    def __init__(self, celery_app: Optional[Celery] = None):
+        self.app = celery_app or app
+        # Task ids submitted through this pipeline that have not yet been
+        # observed in a terminal state; drives adaptive batch sizing.
+        self._inflight_ids: set = set()
+        # Terminal task states are immutable, so once observed they can
+        # be served without touching the backend again (stats replays,
+        # repeated polls of finished workflows).
+        self._terminal_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # On-disk result cache for repeated identical submissions, and
+        # the content keys of submissions whose results we still owe it.
+        self._result_cache = Cache(SIM_CACHE_DIR) if Cache is not None else None
+        self._pending_cache_keys: Dict[str, str] = {}
+
+    def _cache_key(self, tool: str, script: str, params: Optional[Dict[str, Any]]) -> str:
+        """Content hash of one submission, salted with the script mtime.
+
+        Including the mtime (when the script path resolves locally)
+        means editing a script invalidates its cached results.
+        """
+        payload = json.dumps(
+            {"tool": tool, "script": script, "params": params or {}}, sort_keys=True
+        )
+        try:
+            mtime = os.path.getmtime(script)
+        except OSError:
+            mtime = 0.0
+        return hashlib.blake2b(f"{payload}\x00{mtime}".encode(), digest_size=16).hexdigest()
+
+    def _mark_done(self, task_id: str) -> None:
+        self._inflight_ids.discard(task_id)
+
+    def _auto_batch_size(self) -> int:
+        """Size the next batch from the worker-idle vs in-flight ratio.
+
+        Targets roughly two in-flight tasks per active worker: enough to
+        keep workers busy between submissions without queueing so deep
+        that wait_for_any consumers sit behind a long backlog.  Falls
+        back to the maximum batch size when the broker cannot be
+        inspected.
+        """
+        try:
+            active = self.app.control.inspect(timeout=1.0).active() or {}
+        except Exception:
+            return self.AUTO_MAX_BATCH
+        workers = max(1, len(active))
+        target_inflight = 2 * workers
+        next_batch = target_inflight - len(self._inflight_ids)
+        return max(1, min(next_batch, self.AUTO_MAX_BATCH))
+
+    # ------------------------------------------------------------------
+    # Submission
+    # ------------------------------------------------------------------
+
+    def submit_task(
+        self,
+        tool: str,
+        script: str,
+        params: Optional[Dict[str, Any]] = None,
+        priority: int = 5,
+        use_cache: bool = True,
+    ) -> str:
+        """Submit one simulation task; returns the Celery task id.
+
+        When diskcache is installed, identical ``(tool, script,
+        params)`` submissions are served from an on-disk result cache:
+        the stored result is replayed under a fresh synthetic task id
+        that resolves as SUCCESS immediately, skipping the worker.
+        Pass ``use_cache=False`` to force execution.
+        """
+        key = None
+        if use_cache and self._result_cache is not None:
+            key = self._cache_key(tool, script, params)
+            hit = self._result_cache.get(key)
+            if hit is not None:
+                task_id = uuid()
+                self._terminal_cache[task_id] = {
+                    "task_id": task_id,
+                    "state": "SUCCESS",
+                    "result": hit,
+                    "cached": True,
+                }
+                return task_id
+        result = self.app.send_task(
+            SIMULATION_TASK,
+            kwargs={"tool": tool, "script": script, "params": params or {}},
+            priority=priority,
+        )
+        if key is not None:
+            self._pending_cache_keys[result.id] = key
+        return result.id
+
+    def submit_workflow(self, tasks: List[Dict[str, Any]], sequential: bool = True) -> List[str]:
+        """Submit a list of task dicts (tool/script/params keys).
+
+        With ``sequential=False`` the tasks are independent, so the
+        submission RPCs themselves run on a small thread pool — N
+        submits cost roughly one broker round-trip of wall time instead
+        of N serial ones.  (``submit_workflow_group`` goes further and
+        collapses them into a single round-trip.)
+        """
+        if sequential or len(tasks) <= 1:
+            task_ids = []
+            for task in tasks:
+                task_ids.append(self.submit_task(**task))
+            return task_ids
+        with ThreadPoolExecutor(max_workers=min(16, len(tasks))) as executor:
+            return list(executor.map(lambda task: self.submit_task(**task), tasks))
+
+    def submit_workflow_group(self, tasks: List[Dict[str, Any]]):
+        """Submit independent workflow tasks as one Celery group.
+
+        The whole workflow goes to the broker in a single pipelined
+        round-trip instead of one RPC per task.  Returns the
+        ``GroupResult`` so callers can read ``.results`` for the task
+        ids or block in ``join_native`` and let the result backend push
+        completions instead of polling every id on a timer.
+        """
+        result_group = group(self._make_signature(t) for t in tasks).apply_async()
+        self._inflight_ids.update(r.id for r in result_group.results)
+        return result_group
+
+    def _make_signature(self, task: Dict[str, Any], immutable: bool = False):
+        """Build the worker signature for one task dict."""
+        return self.app.signature(
+            SIMULATION_TASK,
+            kwargs={
+                "tool": task["tool"],
+                "script": task["script"],
+                "params": task.get("params") or {},
+            },
+            options={"priority": task.get("priority", 5)},
+            immutable=immutable,
+        )
+
+    def _submit_batch(self, batch: List[Dict[str, Any]]) -> List[str]:
+        """Submit one batch as a single Celery group round-trip.
+
+        A group publishes all of its signatures through one broker
+        connection in a single pipelined exchange, instead of paying one
+        broker round-trip per task the way a submit_task loop does.
+        """
+        result_group = group(self._make_signature(t) for t in batch).apply_async()
+        batch_ids = [r.id for r in result_group.results]
+        self._inflight_ids.update(batch_ids)
+        return batch_ids
+
+    def submit_batch_workflow(
+        self,
+        tasks: Iterable[Dict[str, Any]],
+        batch_size: Any = 10,
+        callback: Optional[Callable[[List[str]], None]] = None,
+    ) -> List[str]:
+        """Submit tasks in batches; ``callback`` fires after each batch.
+
+        With ``batch_size="auto"`` the batch size adapts to broker load:
+        each batch is sized to top the in-flight count back up to about
+        twice the active worker count, and partially filled batches are
+        flushed early rather than stalling idle workers.
+        """
+        auto = batch_size == "auto"
+        target = self._auto_batch_size() if auto else batch_size
+        task_ids: List[str] = []
+        batch: List[Dict[str, Any]] = []
+        last_flush = time.monotonic()
+        for task in tasks:
+            batch.append(task)
+            flush_late = auto and time.monotonic() - last_flush > self.AUTO_FLUSH_DELAY
+            if len(batch) >= target or flush_late:
+                batch_ids = self._submit_batch(batch)
+                task_ids.extend(batch_ids)
+                if callback:
+                    callback(batch_ids)
+                batch = []
+                last_flush = time.monotonic()
+                if auto:
+                    target = self._auto_batch_size()
+        if batch:
+            batch_ids = self._submit_batch(batch)
+            task_ids.extend(batch_ids)
+            if callback:
+                callback(batch_ids)
+        return task_ids
+
+    @staticmethod
+    def _default_sweep_cost(params: Dict[str, Any]) -> float:
+        """Crude runtime estimate: product of the numeric parameters.
+
+        Good enough for LPT ordering of grids like mesh_size x steps,
+        where runtime grows monotonically with each numeric knob.
+        """
+        cost = 1.0
+        for value in params.values():
+            if isinstance(value, (int, float)):
+                cost *= value or 1
+        return cost
+
+    #: Grids at least this large take the vectorized meshgrid path.
+    MESHGRID_MIN_COMBOS = 1024
+
+    @classmethod
+    def _iter_grid(cls, param_grid: Dict[str, List[Any]]) -> Iterable[Dict[str, Any]]:
+        """Yield a params dict per grid combination.
+
+        All-numeric grids above MESHGRID_MIN_COMBOS are expanded in C
+        with numpy.meshgrid — roughly an order of magnitude faster than
+        itertools.product over dicts for million-combination sweeps.
+        Values then come back in the promoted common dtype (a mixed
+        int/float grid yields floats).  Small or non-numeric grids keep
+        the plain product path.
+        """
+        names = list(param_grid)
+        values = list(param_grid.values())
+        total = 1
+        for vals in values:
+            total *= len(vals)
+        numeric = total >= cls.MESHGRID_MIN_COMBOS and all(
+            isinstance(v, (int, float, np.number)) and not isinstance(v, bool)
+            for vals in values
+            for v in vals
+        )
+        if numeric:
+            matrix = np.stack(np.meshgrid(*values, indexing="ij"), axis=-1)
+            for row in matrix.reshape(-1, len(names)).tolist():
+                yield dict(zip(names, row))
+        else:
+            for combo in itertools.product(*values):
+                yield dict(zip(names, combo))
+
+    def _publish_preserialized_sweep(
+        self,
+        tool: str,
+        script: str,
+        params_iter: Iterable[Dict[str, Any]],
+        queue: str = "celery",
+    ) -> List[str]:
+        """Publish sweep tasks with the constant payload prefix encoded once.
+
+        Every sweep task shares the same ``tool``/``script``; encoding
+        that envelope per task is redundant JSON work.  The constant
+        prefix and suffix of the protocol-2 message body are serialized
+        a single time and each task only encodes its varying ``params``,
+        publishing the pre-built JSON string through kombu (which skips
+        re-serialization when given a string plus content type).
+        """
+        prefix = '[[], {"tool": %s, "script": %s, "params": ' % (
+            json.dumps(tool),
+            json.dumps(script),
+        )
+        suffix = '}, {"callbacks": null, "errbacks": null, "chain": null, "chord": null}]'
+        task_ids: List[str] = []
+        with self.app.producer_pool.acquire(block=True) as producer:
+            for params in params_iter:
+                task_id = uuid()
+                producer.publish(
+                    prefix + json.dumps(params) + suffix,
+                    exchange="",
+                    routing_key=queue,
+                    content_type="application/json",
+                    content_encoding="utf-8",
+                    correlation_id=task_id,
+                    reply_to=self.app.oid,
+                    headers={
+                        "lang": "py",
+                        "task": SIMULATION_TASK,
+                        "id": task_id,
+                        "root_id": task_id,
+                        "parent_id": None,
+                        "group": None,
+                    },
+                )
+                task_ids.append(task_id)
+        self._inflight_ids.update(task_ids)
+        return task_ids
+
+    def parameter_sweep(
+        self,
+        tool: str,
+        script: str,
+        param_grid: Dict[str, List[Any]],
+        batch_size: int = 10,
+        cost_fn: Any = None,
+        preserialize: bool = False,
+    ) -> List[str]:
+        """Submit one task per combination of the parameter grid.
+
+        Combinations are submitted longest-expected-first (LPT): the
+        most expensive tasks land on idle workers immediately, hiding
+        their latency behind the rest of the sweep instead of leaving a
+        straggler for last.  ``cost_fn`` maps a params dict to an
+        expected cost; the default multiplies the numeric parameters.
+        Pass ``cost_fn=False`` to skip the ordering and stream the grid
+        lazily — sorting has to materialize the combinations, which
+        matters for very large grids.  ``preserialize=True`` publishes
+        through the raw pre-serialized path, encoding the constant
+        tool/script envelope once for the whole sweep (largest win for
+        huge grids of small tasks; bypasses group batching).
+        """
+        combos = self._iter_grid(param_grid)
+        if cost_fn is not False:
+            combos = sorted(combos, key=cost_fn or self._default_sweep_cost, reverse=True)
+        if preserialize:
+            return self._publish_preserialized_sweep(tool, script, combos)
+        tasks = ({"tool": tool, "script": script, "params": params} for params in combos)
+        return self.submit_batch_workflow(tasks, batch_size=batch_size)
+
+    def submit_dag(self, stages: List[List[Dict[str, Any]]]):
+        """Submit dependent stages as one broker-coordinated workflow.
+
+        ``stages`` is a list of lists of task dicts; every task in stage
+        N must finish before stage N+1 starts.  The stages are composed
+        into nested chords so the broker itself triggers each next stage
+        the moment the previous one completes — no client-side barrier,
+        no polling gap between stages.  Returns the AsyncResult of the
+        final stage; immutable signatures keep upstream results from
+        being injected into downstream tasks.
+        """
+        if not stages:
+            raise ValueError("submit_dag needs at least one stage")
+        workflow = group(self._make_signature(t, immutable=True) for t in stages[-1])
+        for stage in reversed(stages[:-1]):
+            workflow = chord(
+                group(self._make_signature(t, immutable=True) for t in stage),
+                workflow,
+            )
+        return workflow.apply_async()
+
+    # ------------------------------------------------------------------
+    # Status and waiting
+    # ------------------------------------------------------------------
+
+    def get_task_status(self, task_id: str) -> Dict[str, Any]:
+        """Return the current state and (if ready) result of a task."""
+        cached = self._terminal_cache.get(task_id)
+        if cached is not None:
+            return cached
+        result = self.app.AsyncResult(task_id)
+        status: Dict[str, Any] = {"task_id": task_id, "state": result.state}
+        if result.ready():
+            self._mark_done(task_id)
+            if result.successful():
+                status["result"] = result.result
+                key = self._pending_cache_keys.pop(task_id, None)
+                if key is not None and self._result_cache is not None:
+                    self._result_cache.set(key, result.result)
+            else:
+                status["error"] = repr(result.result)
+            if status["state"] in TERMINAL_STATES:
+                self._terminal_cache[task_id] = status
+                if len(self._terminal_cache) > self.TERMINAL_CACHE_MAX:
+                    self._terminal_cache.popitem(last=False)
+        return status
+
+    def monitor_task(
+        self,
+        task_id: str,
+        timeout: Optional[float] = None,
+        poll_interval: float = 2.0,
+        callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+        max_poll_interval: float = 10.0,
+    ) -> Dict[str, Any]:
+        """Poll one task until it reaches a terminal state.
+
+        ``poll_interval`` is the starting cadence; while the state does
+        not change the interval backs off by 1.5x per poll up to
+        ``max_poll_interval``, and resets on every state transition.  A
+        queued task waiting behind a long backlog costs a handful of
+        backend GETs instead of one every couple of seconds.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        last_state = None
+        interval = poll_interval
+        while True:
+            status = self.get_task_status(task_id)
+            if status["state"] != last_state:
+                if callback:
+                    callback(status)
+                last_state = status["state"]
+                interval = poll_interval
+            else:
+                interval = min(interval * 1.5, max_poll_interval)
+            if status["state"] in TERMINAL_STATES:
+                return status
+            if deadline is not None and time.monotonic() >= deadline:
+                return status
+            sleep_for = interval
+            if deadline is not None:
+                sleep_for = min(sleep_for, max(deadline - time.monotonic(), 0.0))
+            time.sleep(sleep_for)
+
+    def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until one task finishes (or the timeout expires)."""
+        return self.monitor_task(task_id, timeout=timeout)
+
+    def _result_pubsub(self):
+        """Subscribe to keyspace notifications for result keys, if possible.
+
+        Requires the Redis backend; enables ``notify-keyspace-events``
+        for generic key events so writes to celery-task-meta-* wake the
+        subscriber.  Returns None when the backend has no pub/sub.
+        """
+        client = getattr(self.app.backend, "client", None)
+        if client is None or not hasattr(client, "pubsub"):
+            return None
+        try:
+            client.config_set("notify-keyspace-events", "Kg$")
+            pubsub = client.pubsub()
+            pubsub.psubscribe("__keyspace@*__:celery-task-meta-*")
+            return pubsub
+        except Exception:
+            return None
+
+    def wait_for_workflow(
+        self,
+        task_ids: List[str],
+        timeout: Optional[float] = None,
+        poll_interval: float = 5.0,
+    ) -> Dict[str, Any]:
+        """Block until every task in the workflow reaches a terminal state.
+
+        With the Redis backend the waiter sleeps on keyspace
+        notifications and is woken per completion, checking only the
+        task whose result key changed.  Without pub/sub it falls back to
+        polling with exponential backoff, 50ms doubling up to
+        ``poll_interval``, so fast tasks are observed quickly and slow
+        ones don't generate a fixed-rate query load.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        pending = {tid for tid in task_ids
+                   if self.get_task_status(tid)["state"] not in TERMINAL_STATES}
+        pubsub = self._result_pubsub()
+        interval = 0.05
+        try:
+            while pending:
+                if deadline is not None and time.monotonic() >= deadline:
+                    break
+                if pubsub is not None:
+                    message = pubsub.get_message(timeout=min(interval, 1.0))
+                    if message and message.get("type") == "pmessage":
+                        channel = message["channel"]
+                        if isinstance(channel, bytes):
+                            channel = channel.decode()
+                        task_id = channel.rsplit("celery-task-meta-", 1)[-1]
+                        if task_id in pending and \
+                                self.get_task_status(task_id)["state"] in TERMINAL_STATES:
+                            pending.discard(task_id)
+                        continue
+                    # No event: fall through to a periodic safety sweep in
+                    # case a completion landed before we subscribed.
+                time.sleep(0 if pubsub is not None else interval)
+                interval = min(interval * 2, poll_interval)
+                pending = {tid for tid in pending
+                           if self.get_task_status(tid)["state"] not in TERMINAL_STATES}
+        finally:
+            if pubsub is not None:
+                pubsub.close()
+        return self.get_parallel_execution_stats(task_ids)
+
+    def wait_for_any(
+        self,
+        task_ids: Iterable[str],
+        timeout: Optional[float] = None,
+    ) -> Optional[str]:
+        """Block until any one task completes; return its id (None on timeout).
+
+        Rather than polling every task each tick, this leans on the
+        result backend's push-based ``get_many`` — with the Redis backend
+        that is a pub/sub subscription, so the caller sleeps until an
+        actual completion event arrives and wakes exactly once per
+        finished task.
+        """
+        ids = list(task_ids)
+        if not ids:
+            return None
+        # Terminal-cached ids — cache replays in particular, whose
+        # synthetic ids never exist in the result backend — must be
+        # served here: get_many would block its full timeout on them.
+        for task_id in ids:
+            if task_id in self._terminal_cache:
+                return task_id
+        try:
+            for task_id, _meta in self.app.backend.get_many(ids, timeout=timeout):
+                self._mark_done(task_id)
+                return task_id
+        except CeleryTimeoutError:
+            return None
+        return None
+
+    # ------------------------------------------------------------------
+    # Statistics
+    # ------------------------------------------------------------------
+
+    def _backend_mget(self, task_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch result metadata for many tasks in one backend round-trip.
+
+        With the Redis backend this is a single MGET over the task-meta
+        keys instead of one GET per task.  Backends without a raw
+        key-value client fall back to per-task fetches.
+        """
+        cache = self._terminal_cache
+        missing = [tid for tid in task_ids if tid not in cache]
+        fetched: Dict[str, Dict[str, Any]] = {}
+        if missing:
+            backend = self.app.backend
+            client = getattr(backend, "client", None)
+            if client is None or not hasattr(client, "mget") or not hasattr(backend, "get_key_for_task"):
+                for tid in missing:
+                    s = self.get_task_status(tid)
+                    fetched[tid] = {"task_id": tid, "status": s["state"], "result": s.get("result")}
+            else:
+                keys = [backend.get_key_for_task(tid) for tid in missing]
+                for task_id, blob in zip(missing, client.mget(keys)):
+                    if blob is None:
+                        fetched[task_id] = {"task_id": task_id, "status": "PENDING", "result": None}
+                    else:
+                        meta = backend.decode(blob)
+                        self._mark_done(task_id)
+                        fetched[task_id] = meta
+        return [
+            fetched[tid] if tid in fetched
+            else {"task_id": tid, "status": cache[tid]["state"], "result": cache[tid].get("result")}
+            for tid in task_ids
+        ]
+
+    def get_parallel_execution_stats(
+        self,
+        task_ids: List[str],
+        include_durations: bool = True,
+    ) -> Dict[str, Any]:
+        """Summarize a set of tasks: counts, durations and speedup.
+
+        The common uniform cases short-circuit: when every task is
+        already cached as SUCCESS and the caller skips duration stats,
+        the summary is synthesized without touching the backend at all
+        (early polls of an all-pending workflow likewise never fetch
+        per-task metadata the cache already rules out).
+        """
+        if not include_durations:
+            cache = self._terminal_cache
+            cached = [cache.get(tid) for tid in task_ids]
+            if cached and all(c is not None and c["state"] == "SUCCESS" for c in cached):
+                n = len(task_ids)
+                return {"total_tasks": n, "completed": n, "failed": 0, "pending": 0}
+        metas = self._backend_mget(task_ids)
+
+        completed = 0
+        failed = 0
+        durations: List[float] = []
+        start_times: List[float] = []
+        end_times: List[float] = []
+        for meta in metas:
+            if meta["status"] == "SUCCESS":
+                completed += 1
+                result = meta.get("result") or {}
+                if isinstance(result, dict):
+                    if "duration_seconds" in result:
+                        durations.append(result["duration_seconds"])
+                    if "started_at" in result:
+                        start_times.append(result["started_at"])
+                    if "finished_at" in result:
+                        end_times.append(result["finished_at"])
+            elif meta["status"] in ("FAILURE", "REVOKED"):
+                failed += 1
+
+        stats: Dict[str, Any] = {
+            "total_tasks": len(task_ids),
+            "completed": completed,
+            "failed": failed,
+            "pending": len(task_ids) - completed - failed,
+        }
+        if durations:
+            # SIMD-backed reductions over a contiguous float64 array;
+            # for 10k+ task sweeps this beats the Python loop by orders
+            # of magnitude.
+            arr = np.fromiter(durations, dtype=np.float64, count=len(durations))
+            total = float(arr.sum())
+            stats["total_duration"] = total
+            stats["avg_duration"] = float(arr.mean())
+            stats["max_duration"] = float(arr.max())
+            if start_times and end_times:
+                wall = float(
+                    np.fromiter(end_times, dtype=np.float64).max()
+                    - np.fromiter(start_times, dtype=np.float64).min()
+                )
+                if wall > 0:
+                    stats["wall_time"] = wall
+                    stats["speedup"] = total / wall
+                    stats["efficiency"] = stats["speedup"] / len(durations)
+        return stats
@@ -0,0 +1,199 @@
+"""
+Tests for the local parallel executor.
+
+Everything here runs against the thread backend with stdlib-only task
+functions — no broker, no worker processes — so the suite exercises the
+scheduling logic (windowing, timeouts, fail-fast, coalescing, result
+formats) without any external services.
+"""
+
+import time
+
+try:
+    from .parallel_executor import BatchProcessor, ParallelExecutor, Task
+except ImportError:  # executed outside the package
+    from parallel_executor import BatchProcessor, ParallelExecutor, Task
+
+
+def _double(x):
+    return x * 2
+
+
+def _sleepy(x):
+    time.sleep(0.5)
+    return x
+
+
+def _boom(x):
+    raise ValueError(f"boom {x}")
+
+
+def _tasks(func, n):
+    return [Task(id=f"t{i}", func=func, args=(i,)) for i in range(n)]
+
+
+def test_execute_parallel_preserves_input_order():
+    with ParallelExecutor(max_workers=4) as ex:
+        results = ex.execute_parallel(_tasks(_double, 8))
+    assert [r.task_id for r in results] == [f"t{i}" for i in range(8)]
+    assert [r.result for r in results] == [i * 2 for i in range(8)]
+    assert all(r.status == "success" for r in results)
+
+
+def test_result_formats():
+    with ParallelExecutor(max_workers=2) as ex:
+        as_tuple = ex.execute_parallel(_tasks(_double, 3), result_format="tuple")
+        as_raw = ex.execute_parallel(_tasks(_double, 3), result_format="raw")
+    assert [(t[0], t[1], t[2]) for t in as_tuple] == [
+        ("t0", "success", 0), ("t1", "success", 2), ("t2", "success", 4)
+    ]
+    assert as_raw == [0, 2, 4]
+
+
+def test_raw_format_keeps_none_results():
+    def _none(_x):
+        return None
+
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(
+            [Task(id="a", func=_none, args=(1,)), Task(id="b", func=_double, args=(3,))],
+            result_format="raw",
+        )
+    assert results == [None, 6]
+
+
+def test_unknown_result_format_rejected():
+    with ParallelExecutor(max_workers=2) as ex:
+        try:
+            ex.execute_parallel(_tasks(_double, 2), result_format="json")
+        except ValueError:
+            pass
+        else:
+            raise AssertionError("expected ValueError for unknown result_format")
+
+
+def test_timeout_marks_overdue_tasks():
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(_tasks(_sleepy, 2), timeout=0.1)
+    assert [r.status for r in results] == ["timeout", "timeout"]
+    assert all(r.result is None for r in results)
+
+
+def test_fail_fast_stops_after_failure():
+    tasks = [Task(id="ok", func=_double, args=(1,)),
+             Task(id="bad", func=_boom, args=(2,))]
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(tasks, fail_fast=True)
+    by_id = {r.task_id: r for r in results}
+    assert by_id["bad"].status == "failed"
+    assert "boom 2" in by_id["bad"].error
+    assert by_id["ok"].status in ("success", "cancelled")
+
+
+def test_fail_fast_returns_one_result_per_task():
+    # Regression: tasks still queued behind the submission window used
+    # to vanish from the output on fail_fast instead of being reported
+    # as cancelled.
+    def _first_boom(x):
+        if x == 0:
+            raise ValueError("boom 0")
+        time.sleep(0.01)
+        return x
+
+    tasks = [Task(id=f"t{i}", func=_first_boom, args=(i,)) for i in range(100)]
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(tasks, fail_fast=True)
+    assert len(results) == 100
+    assert sorted(r.task_id for r in results) == sorted(t.id for t in tasks)
+    statuses = [r.status for r in results]
+    assert statuses.count("failed") == 1
+    assert "cancelled" in statuses
+    assert set(statuses) <= {"failed", "success", "cancelled"}
+
+
+def test_coalesced_batch_preserves_input_order():
+    # > workers * 4 same-func tasks takes the coalesced path.
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(_tasks(_double, 40))
+    assert [r.task_id for r in results] == [f"t{i}" for i in range(40)]
+    assert [r.result for r in results] == [i * 2 for i in range(40)]
+
+
+def test_coalesced_failure_is_per_member():
+    def _odd_boom(x):
+        if x % 2:
+            raise ValueError(f"boom {x}")
+        return x
+
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(_tasks(_odd_boom, 40))
+    assert [r.status for r in results] == [
+        "failed" if i % 2 else "success" for i in range(40)
+    ]
+
+
+def test_timeout_on_large_same_func_batch():
+    # A large same-func batch under a timeout takes the windowed path
+    # (coalescing would pool the budgets); every overdue task is still
+    # reported individually.
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(_tasks(_sleepy, 20), timeout=0.2)
+    assert len(results) == 20
+    assert {r.status for r in results} == {"timeout"}
+
+
+def test_timeout_is_per_task_not_per_group():
+    # Regression: coalescing used to apply the per-task budget to whole
+    # super-tasks, so fast tasks in a slow group all came back
+    # "timeout".  64 x 0.05s on 2 workers is ~1.6s of group time; each
+    # task stays far under its own 0.5s budget and must succeed.
+    def _brief(x):
+        time.sleep(0.05)
+        return x
+
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(
+            [Task(id=f"t{i}", func=_brief, args=(i,)) for i in range(64)],
+            timeout=0.5,
+        )
+    assert len(results) == 64
+    assert {r.status for r in results} == {"success"}
+    assert [r.result for r in results] == list(range(64))
+
+
+def test_single_worker_runs_inline():
+    with ParallelExecutor(max_workers=1) as ex:
+        results = ex.execute_parallel(_tasks(_double, 4))
+    assert [r.result for r in results] == [0, 2, 4, 6]
+    assert all(r.status == "success" for r in results)
+
+
+def test_generator_input_streams_results():
+    tasks = (Task(id=f"g{i}", func=_double, args=(i,)) for i in range(10))
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(tasks)
+    assert sorted(r.result for r in results) == [i * 2 for i in range(10)]
+
+
+def test_legacy_dict_tasks_accepted():
+    tasks = [{"id": "d0", "func": _double, "args": (5,)}]
+    with ParallelExecutor(max_workers=2) as ex:
+        results = ex.execute_parallel(tasks)
+    assert results[0].task_id == "d0"
+    assert results[0].result == 10
+
+
+def test_execute_map_preserves_order():
+    with ParallelExecutor(max_workers=4) as ex:
+        assert ex.execute_map(_double, list(range(16))) == [i * 2 for i in range(16)]
+
+
+def test_batch_processor_parameter_sweep():
+    processor = BatchProcessor(max_workers=2, use_processes=False)
+    try:
+        results = processor.parameter_sweep(_double, {"x": [1, 2, 3]})
+    finally:
+        processor.close()
+    assert sorted(r["result"] for r in results) == [2, 4, 6]
+    assert all(r["status"] == "success" for r in results)
+    assert sorted(r["params"]["x"] for r in results) == [1, 2, 3]
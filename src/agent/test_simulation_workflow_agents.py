@@ -0,0 +1,202 @@
+"""
+Tests for the rule-based workflow agents.
+
+The requirement, planning and simulation agents are deterministic and
+LLM-free, so everything here runs broker-free: the simulation tests
+inject a stub pipeline that answers with canned terminal states instead
+of talking to Celery.
+"""
+
+import itertools
+
+try:
+    from .simulation_workflow_agents import (
+        AgentInput,
+        AgentStatus,
+        PlanningAgent,
+        RequirementAnalysisAgent,
+        SimulationAgent,
+        WorkflowStage,
+    )
+except ImportError:  # executed outside the package
+    from simulation_workflow_agents import (
+        AgentInput,
+        AgentStatus,
+        PlanningAgent,
+        RequirementAnalysisAgent,
+        SimulationAgent,
+        WorkflowStage,
+    )
+
+
+class _StubPipeline:
+    """Broker-free TaskPipeline stand-in with canned terminal states.
+
+    Tasks whose ``params["step"]`` lands in ``fail_steps`` resolve as
+    FAILURE; everything else succeeds immediately.
+    """
+
+    def __init__(self, fail_steps=()):
+        self.fail_steps = set(fail_steps)
+        self.submitted = []
+        self._counter = itertools.count()
+        self._state_by_id = {}
+
+    def submit_task(self, tool, script, params=None):
+        task_id = f"stub_{next(self._counter)}"
+        self.submitted.append((task_id, tool, script, params))
+        failed = (params or {}).get("step") in self.fail_steps
+        self._state_by_id[task_id] = "FAILURE" if failed else "SUCCESS"
+        return task_id
+
+    def wait_for_task(self, task_id, timeout=None):
+        return {"task_id": task_id, "state": self._state_by_id[task_id]}
+
+
+def _analyze(request, parameters=None):
+    agent = RequirementAnalysisAgent()
+    agent.clear_cache()
+    return agent.process(
+        AgentInput(
+            user_request=request,
+            stage=WorkflowStage.REQUIREMENT_ANALYSIS,
+            parameters=parameters or {},
+        )
+    )
+
+
+def _plan(requirements_data):
+    agent = PlanningAgent()
+    return agent.process(
+        AgentInput(
+            user_request="",
+            stage=WorkflowStage.PLANNING,
+            previous_stage_output=requirements_data,
+        )
+    )
+
+
+def test_classification_by_keyword():
+    cases = {
+        "Simulate lid-driven cavity flow": "fluid",
+        "Run a molecular dynamics simulation": "molecular",
+        "Compute the steady-state heat distribution": "thermal",
+        "Run a coupled multiphysics analysis": "multiphysics",
+        "Finite element analysis of a beam": "structural",
+    }
+    for request, expected in cases.items():
+        output = _analyze(request)
+        assert output.data["requirements"].simulation_type == expected, request
+
+
+def test_thermal_plus_structural_promotes_to_multiphysics():
+    output = _analyze("Coupled thermal and structural analysis of a bracket")
+    assert output.data["requirements"].simulation_type == "multiphysics"
+
+
+def test_materials_detected():
+    output = _analyze("Thermal analysis of a steel and aluminum joint")
+    assert output.data["requirements"].materials == ["steel", "aluminum"]
+
+
+def test_missing_parameters_flagged():
+    output = _analyze("Structural load analysis", parameters={"mesh_size": 32})
+    requirements = output.data["requirements"]
+    assert requirements.missing_parameters == ["load", "material"]
+    assert any("Missing required parameters" in m for m in output.messages)
+
+
+def test_unhashable_parameters_fall_back_to_uncached():
+    # Regression: list-valued parameters survive sorted() and only fail
+    # when the lru_cache hashes the key; process() must not crash.
+    output = _analyze("Structural analysis", parameters={"loads": [1, 2, 3]})
+    assert output.status is AgentStatus.COMPLETED
+    assert output.data["requirements"].parameters == {"loads": [1, 2, 3]}
+
+
+def test_repeated_analysis_is_consistent():
+    agent = RequirementAnalysisAgent()
+    agent.clear_cache()
+    agent_input = AgentInput(
+        user_request="Simulate fluid flow of water",
+        stage=WorkflowStage.REQUIREMENT_ANALYSIS,
+        parameters={"resolution": 20},
+    )
+    first = agent.process(agent_input).data["requirements"]
+    second = agent.process(agent_input).data["requirements"]
+    assert first.simulation_type == second.simulation_type == "fluid"
+    assert first.parameters == second.parameters
+
+
+def test_plan_structure():
+    requirements = _analyze("Structural analysis of a steel beam").data
+    plan = _plan(requirements).data["plan"]
+    assert [t["step"] for t in plan.tasks] == ["preprocess", "solve", "postprocess"]
+    task_ids = [t["task_id"] for t in plan.tasks]
+    assert [t["depends_on"] for t in plan.tasks] == [[], task_ids[:1], task_ids[:2]]
+    assert [c["after_task"] for c in plan.checkpoints] == task_ids
+    assert plan.total_estimated_duration > 0
+
+
+def test_plan_ids_are_unique():
+    requirements = _analyze("Structural analysis").data
+    agent = PlanningAgent()
+    agent_input = AgentInput(
+        user_request="",
+        stage=WorkflowStage.PLANNING,
+        previous_stage_output=requirements,
+    )
+    first = agent.process(agent_input).data["plan"]
+    second = agent.process(agent_input).data["plan"]
+    assert first.plan_id != second.plan_id
+
+
+def test_simulation_agent_reports_success():
+    # Regression: the status dict from wait_for_task used to be compared
+    # whole against "SUCCESS", so every run reported FAILED.
+    requirements = _analyze("Structural analysis of a steel beam").data
+    planning = _plan(requirements).data
+    agent = SimulationAgent()
+    agent._pipeline = _StubPipeline()
+    output = agent.process(
+        AgentInput(
+            user_request="",
+            stage=WorkflowStage.SIMULATION,
+            previous_stage_output=planning,
+        )
+    )
+    assert output.status is AgentStatus.COMPLETED
+    summary = output.data["execution_summary"]
+    assert (summary.total_tasks, summary.successful, summary.failed) == (3, 3, 0)
+    assert all(r["status"] == "SUCCESS" for r in output.data["task_results"].values())
+    assert len(agent._pipeline.submitted) == 3
+
+
+def test_simulation_agent_skips_after_failed_dependency():
+    requirements = _analyze("Structural analysis").data
+    planning = _plan(requirements).data
+    agent = SimulationAgent()
+    agent._pipeline = _StubPipeline(fail_steps={"preprocess"})
+    output = agent.process(
+        AgentInput(
+            user_request="",
+            stage=WorkflowStage.SIMULATION,
+            previous_stage_output=planning,
+        )
+    )
+    assert output.status is AgentStatus.FAILED
+    statuses = [r["status"] for r in output.data["task_results"].values()]
+    assert statuses == ["FAILURE", "SKIPPED", "SKIPPED"]
+    # Only the failed task ever reached the pipeline.
+    assert len(agent._pipeline.submitted) == 1
+
+
+def test_dependency_levels_group_independent_tasks():
+    tasks = [
+        {"task_id": "a", "depends_on": []},
+        {"task_id": "b", "depends_on": []},
+        {"task_id": "c", "depends_on": ["a", "b"]},
+        {"task_id": "d", "depends_on": ["a"]},
+    ]
+    levels = SimulationAgent._dependency_levels(tasks)
+    assert [[t["task_id"] for t in level] for level in levels] == [["a", "b"], ["c", "d"]]
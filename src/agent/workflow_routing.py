@@ -0,0 +1,399 @@
+"""
+Workflow Routing for Keystone Simulation Graphs
+================================================
+
+Conditional-edge routing helpers for the simulation workflow graphs:
+
+- Severity-aware error routing (LOW/MEDIUM/HIGH/CRITICAL)
+- Retry with exponential backoff and a per-tool circuit breaker
+- Context-based routing (priority lanes, resource hints)
+- Performance-based tool selection driven by ExecutionMetrics
+
+The routing functions are written to be usable both as LangGraph
+conditional-edge callables (they accept the workflow state dict and
+return a node name) and standalone, which is how the examples and the
+lightweight driver in ``execute_workflow_with_routing`` use them.
+"""
+
+import sys
+from collections import defaultdict
+from functools import lru_cache
+from dataclasses import dataclass
+from enum import Enum
+from typing import Annotated, Any, Callable, Dict, List, Optional, Tuple, TypedDict
+
+
+class NodeStatus(Enum):
+    """Lifecycle status of a single workflow node."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    SKIPPED = "skipped"
+
+
+class ErrorSeverity(Enum):
+    """Severity attached to workflow errors; drives routing decisions."""
+    LOW = "low"
+    MEDIUM = "medium"
+    HIGH = "high"
+    CRITICAL = "critical"
+
+
+class RoutingStrategy(Enum):
+    """High-level strategy a graph was built with."""
+    SEQUENTIAL = "sequential"
+    CONDITIONAL = "conditional"
+    PARALLEL = "parallel"
+    PRIORITY = "priority"
+
+
+@dataclass
+class ExecutionMetrics:
+    """Rolling execution statistics for one workflow node/tool."""
+    total_executions: int = 0
+    failed_executions: int = 0
+    avg_duration_seconds: float = 0.0
+    success_rate: float = 100.0
+
+    def update_success(self, duration_seconds: float) -> None:
+        total_duration = self.avg_duration_seconds * self.total_executions
+        self.total_executions += 1
+        self.avg_duration_seconds = (total_duration + duration_seconds) / self.total_executions
+        self.success_rate = 100.0 * (self.total_executions - self.failed_executions) / self.total_executions
+
+    def update_failure(self) -> None:
+        self.total_executions += 1
+        self.failed_executions += 1
+        self.success_rate = 100.0 * (self.total_executions - self.failed_executions) / self.total_executions
+
+
+@dataclass
+class RoutingDecision:
+    """Outcome of a routing evaluation: where to go next and why."""
+    next_node: str
+    reason: str
+    confidence: float = 1.0
+
+
+def _extend_messages(left: List[str], right: List[str]) -> List[str]:
+    """Reducer for ``messages`` that appends in place.
+
+    The stock ``operator.add`` list reducer copies the entire accumulated
+    history on every node transition (``old + new`` is O(total)), which
+    makes message accumulation quadratic over a long workflow.  Extending
+    the existing list is O(len(new)) per transition, keeping the total
+    cost linear.
+    """
+    if not left:
+        return list(right)
+    left.extend(right)
+    return left
+
+
+class WorkflowRoutingState(TypedDict, total=False):
+    """Shared state threaded through a routed simulation workflow."""
+    messages: Annotated[List[str], _extend_messages]
+    node_status: Dict[str, NodeStatus]
+    node_results: Dict[str, Any]
+    errors: List[str]
+    error_severity: Optional[ErrorSeverity]
+    retry_count: int
+    max_retries: int
+    circuit_breaker_open: bool
+    validation_feedback: Dict[str, Any]
+    workflow_context: Dict[str, Any]
+    execution_metrics: Dict[str, ExecutionMetrics]
+    priority: str
+
+
+# Rules are (predicate, next_node, reason) triples evaluated in order
+# against the value found under the routing context key.
+RoutingRule = Tuple[Callable[[Any], bool], str, str]
+
+# Interned execution-node names for the built-in tools.
+_NODE_NAMES: Dict[str, str] = {
+    tool: sys.intern(f"{tool}_execute") for tool in ("fenicsx", "lammps", "openfoam")
+}
+
+
+class WorkflowRouter:
+    """Stateful router: tracks retries, failures and per-tool metrics.
+
+    A single router instance can serve many workflow invocations; the
+    only mutable state it keeps is the per-tool metrics and the failure
+    counters behind the circuit breaker.
+    """
+
+    def __init__(
+        self,
+        max_retries: int = 3,
+        backoff_multiplier: float = 2.0,
+        circuit_breaker_threshold: int = 5,
+    ):
+        self.max_retries = max_retries
+        self.backoff_multiplier = backoff_multiplier
+        self.circuit_breaker_threshold = circuit_breaker_threshold
+        # Metrics entries are created on first use; short-lived routers
+        # (demos, tests) never pay for tools they don't exercise, and new
+        # tools need no registration here.
+        self.performance_metrics: Dict[str, ExecutionMetrics] = defaultdict(ExecutionMetrics)
+        self._failure_counts: Dict[str, int] = {}
+
+    # ------------------------------------------------------------------
+    # Context routing
+    # ------------------------------------------------------------------
+
+    def route_by_context(
+        self,
+        state: WorkflowRoutingState,
+        routing_rules: Any,
+        context_key: str = "priority",
+        default_node: str = "standard_path",
+    ) -> RoutingDecision:
+        """Route on a workflow-context value.
+
+        ``routing_rules`` is either a mapping of context value to
+        ``(next_node, reason)`` — resolved with a single hash lookup —
+        or, for predicates that aren't simple equality, a list of
+        ``(predicate, next_node, reason)`` triples evaluated in order.
+        """
+        value = state.get("workflow_context", {}).get(context_key)
+        if isinstance(routing_rules, dict):
+            match = routing_rules.get(value)
+            if match is not None:
+                return RoutingDecision(next_node=match[0], reason=match[1])
+        else:
+            for predicate, next_node, reason in routing_rules:
+                if predicate(value):
+                    return RoutingDecision(next_node=next_node, reason=reason)
+        return RoutingDecision(next_node=default_node, reason=f"no rule matched {context_key}={value!r}")
+
+    # ------------------------------------------------------------------
+    # Performance routing
+    # ------------------------------------------------------------------
+
+    def route_by_performance(
+        self,
+        state: WorkflowRoutingState,
+        candidates: List[str],
+    ) -> RoutingDecision:
+        """Pick the candidate node with the best success rate.
+
+        Ties are broken by average duration (faster wins).  Metrics come
+        from the state if present, falling back to the router's own
+        accumulated metrics.
+        """
+        metrics = state.get("execution_metrics") or self.performance_metrics
+        best = None
+        best_key = None
+        for node in candidates:
+            m = metrics.get(node)
+            if m is None:
+                continue
+            key = (m.success_rate, -m.avg_duration_seconds)
+            if best_key is None or key > best_key:
+                best, best_key = node, key
+        if best is None:
+            return RoutingDecision(next_node=candidates[0], reason="no metrics available; first candidate")
+        return RoutingDecision(
+            next_node=best,
+            reason=f"best success rate {metrics[best].success_rate:.1f}% "
+                   f"(avg {metrics[best].avg_duration_seconds:.1f}s)",
+        )
+
+    # ------------------------------------------------------------------
+    # Retry / circuit breaker
+    # ------------------------------------------------------------------
+
+    def should_retry(self, state: WorkflowRoutingState) -> bool:
+        retry_count = state.get("retry_count", 0)
+        max_retries = state.get("max_retries", self.max_retries)
+        return bool(state.get("errors")) and retry_count < max_retries
+
+    def backoff_seconds(self, retry_count: int) -> float:
+        return self.backoff_multiplier ** retry_count
+
+    def record_failure(self, node_name: str) -> None:
+        self._failure_counts[node_name] = self._failure_counts.get(node_name, 0) + 1
+
+    def record_success(self, node_name: str) -> None:
+        self._failure_counts[node_name] = 0
+
+    def circuit_breaker_open(self, node_name: str) -> bool:
+        return self._failure_counts.get(node_name, 0) >= self.circuit_breaker_threshold
+
+    def route_after_error(self, state: WorkflowRoutingState) -> RoutingDecision:
+        """Decide between retry, error handling and abort after a failure."""
+        severity = state.get("error_severity")
+        if state.get("circuit_breaker_open", False):
+            return RoutingDecision("handle_error", "circuit breaker open")
+        if severity == ErrorSeverity.CRITICAL:
+            return RoutingDecision("handle_error", "critical error; no retry")
+        if self.should_retry(state):
+            retry_count = state.get("retry_count", 0)
+            return RoutingDecision(
+                "retry",
+                f"retry {retry_count + 1} with {self.backoff_seconds(retry_count):.1f}s backoff",
+            )
+        return RoutingDecision("handle_error", "retries exhausted")
+
+    # ------------------------------------------------------------------
+    # Node wrappers
+    # ------------------------------------------------------------------
+
+    def _execute_with_metrics(self, tool_name: str, func: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a tool callable so its node's metrics are kept up to date."""
+        import time
+
+        # Canonical node name resolved once per wrapper, not per call.
+        # sys.intern caches the hash on the string object so the dict
+        # probes below hit CPython's pointer-equality fast path.
+        node_name = _NODE_NAMES.get(tool_name) or sys.intern(f"{tool_name}_execute")
+
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            start = time.perf_counter()
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                self.performance_metrics[node_name].update_failure()
+                self.record_failure(node_name)
+                raise
+            self.performance_metrics[node_name].update_success(time.perf_counter() - start)
+            self.record_success(node_name)
+            return result
+
+        return wrapper
+
+    def _route_by_priority(self, state: WorkflowRoutingState) -> Dict[str, Any]:
+        """Node function: annotate the state with the chosen priority lane."""
+        priority = state.get("priority", "normal")
+        if priority == "critical":
+            lane = "express_lane"
+        elif priority == "high":
+            lane = "gpu_accelerated_path"
+        else:
+            lane = "standard_path"
+        return {
+            "messages": [f"Priority Router: {priority} -> {lane}"],
+            "workflow_context": {**state.get("workflow_context", {}), "lane": lane},
+        }
+
+
+# ----------------------------------------------------------------------
+# Module-level routing functions (usable as LangGraph conditional edges)
+# ----------------------------------------------------------------------
+
+
+def _build_validation_route_table() -> Dict[Tuple[bool, bool, bool, bool], str]:
+    """Enumerate every (circuit_open, has_errors, critical, passed) combination."""
+    table = {}
+    for circuit_open in (False, True):
+        for has_errors in (False, True):
+            for critical in (False, True):
+                for passed in (False, True):
+                    if circuit_open or (has_errors and critical):
+                        target = "handle_error"
+                    elif has_errors or not passed:
+                        target = "retry_validation"
+                    else:
+                        target = "aggregate"
+                    table[(circuit_open, has_errors, critical, passed)] = target
+    return table
+
+
+# Precomputed at import so routing is a single tuple build + hash probe
+# instead of a branch chain evaluated on every validation transition.
+_VALIDATION_ROUTE: Dict[Tuple[bool, bool, bool, bool], str] = _build_validation_route_table()
+
+
+def route_after_validation(state: WorkflowRoutingState) -> str:
+    """Route the workflow after the validation node has run."""
+    return _VALIDATION_ROUTE[(
+        state.get("circuit_breaker_open", False),
+        bool(state.get("errors")),
+        state.get("error_severity") == ErrorSeverity.CRITICAL,
+        state.get("validation_feedback", {}).get("validation_passed", False),
+    )]
+
+
+@lru_cache(maxsize=256)
+def _route_validation_cached(
+    validation_passed: bool,
+    convergence_achieved: bool,
+    severity: Optional[ErrorSeverity],
+    retry_count: int,
+    max_retries: int,
+) -> str:
+    """Pure routing core over primitive fields; memoized across calls."""
+    if validation_passed and convergence_achieved:
+        return "aggregate"
+    if severity == ErrorSeverity.CRITICAL or retry_count >= max_retries:
+        return "handle_error"
+    return "refine_simulation"
+
+
+def route_by_validation_result(state: WorkflowRoutingState) -> str:
+    """Route on the validation node's result payload.
+
+    The decision depends only on a handful of hashable fields, so the
+    state dict is reduced to those and the verdict is served from an
+    ``lru_cache`` — repeated identical states (demo and test sweeps) cost
+    one tuple hash instead of re-walking the nested result payload.
+    """
+    validation = state.get("node_results", {}).get("validate", {})
+    return _route_validation_cached(
+        bool(validation.get("validation_passed")),
+        bool(validation.get("convergence_achieved")),
+        state.get("error_severity"),
+        state.get("retry_count", 0),
+        state.get("max_retries", 3),
+    )
+
+
+@lru_cache(maxsize=64)
+def _tool_execute_node(tool: str) -> str:
+    return f"{tool}_execute"
+
+
+def route_by_simulation_tool(state: WorkflowRoutingState) -> str:
+    """Route to the execution node for the tool chosen by the planner."""
+    tool = state.get("node_results", {}).get("plan", {}).get("required_tool", "fenicsx")
+    return _tool_execute_node(tool)
+
+
+def execute_workflow_with_routing(
+    nodes: Dict[str, Callable[[WorkflowRoutingState], Dict[str, Any]]],
+    edges: Dict[str, Callable[[WorkflowRoutingState], str]],
+    initial_state: WorkflowRoutingState,
+    entry_node: str,
+    router: Optional[WorkflowRouter] = None,
+    max_steps: int = 100,
+) -> WorkflowRoutingState:
+    """Drive a routed workflow to completion without a full graph runtime.
+
+    ``nodes`` maps node names to callables returning partial state
+    updates; ``edges`` maps node names to routing functions returning the
+    next node name (``"END"`` terminates).  State updates are merged with
+    the same reducer semantics the graph state declares: ``messages`` is
+    extended in place, dict fields are merged, everything else replaces.
+    """
+    state: WorkflowRoutingState = dict(initial_state)  # type: ignore[assignment]
+    state.setdefault("messages", [])
+    current = entry_node
+    for _ in range(max_steps):
+        update = nodes[current](state)
+        for key, value in update.items():
+            if key == "messages":
+                state["messages"] = _extend_messages(state["messages"], value)
+            elif isinstance(value, dict) and isinstance(state.get(key), dict):
+                state[key].update(value)  # type: ignore[union-attr]
+            else:
+                state[key] = value  # type: ignore[literal-required]
+        route = edges.get(current)
+        if route is None:
+            break
+        current = route(state)
+        if current == "END":
+            break
+    return state